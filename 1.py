@@ -1,10 +1,16 @@
+from calendar import isleap
 from collections import UserDict
-from datetime import datetime, timedelta
-import pickle
-import re
+from datetime import date
+import os
+import sys
+
+
+_LOAD_CACHE = {}
 
 
 class Field:
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -13,111 +19,342 @@ class Field:
 
 
 class Name(Field):
-    pass
+    __slots__ = ()
+
+    def __init__(self, value):
+        super().__init__(sys.intern(value))
 
 
 class Phone(Field):
+    __slots__ = ()
+
     def __init__(self, value):
-        if not self.validate(value):
-            raise ValueError("Invalid phone number format. Should start from 0 and be 10 digits")
-        super().__init__(value)
+        super().__init__(self._validate(value))
 
-    def validate(self, value):
+    @staticmethod
+    def validate(value):
         return len(value) == 10 and value.isdigit()
 
+    @staticmethod
+    def _validate(value):
+        if not Phone.validate(value):
+            raise ValueError("Invalid phone number format. Should start from 0 and be 10 digits")
+        return value
+
 
 class Birthday(Field):
+    __slots__ = ("date",)
+
     def __init__(self, value):
-        if not self.validate(value):
-            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+        self.date = self._parse(value)
         super().__init__(value)
 
-    def validate(self, value):
+    @staticmethod
+    def validate(value):
         try:
-            datetime.strptime(value, "%d.%m.%Y")
+            Birthday._parse(value)
             return True
         except ValueError:
             return False
 
+    @staticmethod
+    def _parse(value):
+        digits = value[0:2] + value[3:5] + value[6:10]
+        if len(value) != 10 or value[2] != "." or value[5] != "." or not digits.isdigit():
+            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+        try:
+            return date(int(value[6:10]), int(value[3:5]), int(value[0:2]))
+        except ValueError:
+            raise ValueError("Invalid date format. Use DD.MM.YYYY") from None
+
 
 class Record:
+    __slots__ = ("name", "_phones", "_phone_set", "_birthday", "_str_cache", "_phones_cache", "_book")
+
     def __init__(self, name):
         self.name = Name(name)
-        self.phones = []
-        self.birthday = None
+        self._phones = []
+        self._phone_set = set()
+        self._birthday = None
+        self._str_cache = None
+        self._phones_cache = ()
+        self._book = None
+
+    @property
+    def phones(self):
+        if self._phones_cache is None:
+            self._phones_cache = tuple(self._phones)
+        return self._phones_cache
+
+    @property
+    def birthday(self):
+        return self._birthday
+
+    @birthday.setter
+    def birthday(self, value):
+        book = self._book
+        if book is not None:
+            book._unindex_birthday(self)
+        self._birthday = value
+        self._changed()
+        if book is not None:
+            book._index_birthday(self)
+
+    def _changed(self):
+        self._str_cache = None
+        self._phones_cache = None
+        if self._book is not None:
+            self._book._dirty = True
 
     def add_phone(self, phone_number):
-        self.phones.append(Phone(phone_number))
+        phone = Phone._validate(phone_number)
+        if phone in self._phone_set:
+            return False
+        self._phone_set.add(phone)
+        self._phones.append(phone)
+        self._changed()
+        return True
 
     def remove_phone(self, phone_number):
-        for phone in self.phones:
-            if phone.value == phone_number:
-                self.phones.remove(phone)
+        if phone_number in self._phone_set:
+            self._phone_set.discard(phone_number)
+            self._phones.remove(phone_number)
+            self._changed()
 
     def edit_phone(self, old_phone, new_phone):
-        for phone in self.phones:
-            if phone.value == old_phone:
-                phone.value = new_phone
-                return
-        raise ValueError("Phone number not found")
+        if old_phone not in self._phone_set:
+            raise ValueError("Phone number not found")
+        phone = Phone._validate(new_phone)
+        self._phone_set.discard(old_phone)
+        if phone in self._phone_set:
+            self._phones.remove(old_phone)
+        else:
+            self._phone_set.add(phone)
+            self._phones[self._phones.index(old_phone)] = phone
+        self._changed()
 
     def add_birthday(self, new_birthday):
         self.birthday = Birthday(new_birthday)
 
     def __str__(self):
-        phones = '; '.join(phone.value for phone in self.phones)
+        if self._str_cache is not None:
+            return self._str_cache
+        phones = '; '.join(self._phones)
         birthday = f", birthday: {self.birthday.value}" if self.birthday else ""
-        return f"Contact name: {self.name.value}, phones: {phones}{birthday}"
+        self._str_cache = f"Contact name: {self.name.value}, phones: {phones}{birthday}"
+        return self._str_cache
+
+    def to_dict(self):
+        return {
+            "name": self.name.value,
+            "phones": list(self._phones),
+            "birthday": self.birthday.value if self.birthday else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls(data["name"])
+        for phone in data["phones"]:
+            record.add_phone(phone)
+        if data["birthday"]:
+            record.add_birthday(data["birthday"])
+        return record
 
 
 class AddressBook(UserDict):
+    def __init__(self, *args, **kwargs):
+        self._birthday_index = {}
+        self._dirty = False
+        super().__init__(*args, **kwargs)
+
+    def __setitem__(self, name, record):
+        if record._book is not None and record._book is not self:
+            raise ValueError(f"Contact {record.name.value} already belongs to another address book")
+        name = sys.intern(name)
+        if name in self.data:
+            del self[name]
+        self.data[name] = record
+        record._book = self
+        self._index_birthday(record)
+        self._dirty = True
+
+    def __delitem__(self, name):
+        record = self.data.pop(sys.intern(name))
+        self._unindex_birthday(record)
+        record._book = None
+        self._dirty = True
+
+    def copy(self):
+        book = type(self)()
+        book.data = {name: Record.from_dict(record.to_dict()) for name, record in self.data.items()}
+        book._adopt_records()
+        return book
+
+    def _adopt_records(self):
+        for record in self.data.values():
+            record._book = self
+        self._rebuild_birthday_index()
+
     def add_record(self, record):
-        self.data[record.name.value] = record
+        self[record.name.value] = record
 
     def find(self, name):
-        return self.data.get(name, None)
+        return self.data.get(sys.intern(name), None)
 
     def delete(self, name):
+        name = sys.intern(name)
         if name in self.data:
-            del self.data[name]
+            del self[name]
+
+    def _index_birthday(self, record):
+        if record.birthday:
+            birthday_date = record.birthday.date
+            month_day = (birthday_date.month, birthday_date.day)
+            self._birthday_index.setdefault(month_day, []).append(record.name.value)
+
+    def _unindex_birthday(self, record):
+        if record.birthday:
+            birthday_date = record.birthday.date
+            month_day = (birthday_date.month, birthday_date.day)
+            names = self._birthday_index.get(month_day)
+            if names and record.name.value in names:
+                names.remove(record.name.value)
+                if not names:
+                    del self._birthday_index[month_day]
+
+    def _rebuild_birthday_index(self):
+        self._birthday_index = {}
+        for record in self.data.values():
+            self._index_birthday(record)
 
     def get_upcoming_birthdays(self):
-        today = datetime.now().date()
+        today = date.today()
         upcoming_birthdays = []
 
-        for record in self.data.values():
-            if record.birthday:
-                birthday_date = datetime.strptime(record.birthday.value, "%d.%m.%Y").date()
-                birthday_this_year = birthday_date.replace(year=today.year)
-
-                if birthday_this_year < today:
-                    birthday_this_year = birthday_this_year.replace(year=today.year + 1)
-
-                days_until_birthday = (birthday_this_year - today).days
-
-                if 0 <= days_until_birthday <= 7:
-                    congratulation_date = birthday_this_year
-
-                    if congratulation_date.weekday() >= 5:
-                        congratulation_date += timedelta(days=(7 - congratulation_date.weekday()))
-
-                    upcoming_birthdays.append({
-                        "name": record.name.value,
-                        "congratulation_date": congratulation_date.strftime("%Y.%m.%d")
-                    })
+        for offset in range(8):
+            day = date.fromordinal(today.toordinal() + offset)
+            names = self._birthday_index.get((day.month, day.day), [])
+            if day.month == 2 and day.day == 28 and not isleap(day.year):
+                names = names + self._birthday_index.get((2, 29), [])
+            if not names:
+                continue
+
+            weekday = day.weekday()
+            shift = 7 - weekday if weekday >= 5 else 0
+            congratulation_date = date.fromordinal(day.toordinal() + shift) if shift else day
+            congratulation_date = congratulation_date.strftime("%Y.%m.%d")
+
+            for name in names:
+                upcoming_birthdays.append({
+                    "name": name,
+                    "congratulation_date": congratulation_date
+                })
 
         return upcoming_birthdays
 
     def save_to_file(self, filename):
-        with open(filename, 'wb') as f:
-            pickle.dump(self.data, f)
+        import json
+        items = [record.to_dict() for record in self.data.values()]
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
+        _LOAD_CACHE.pop(filename, None)
+        self._dirty = False
+
+    def save_if_dirty(self, filename):
+        if self._dirty or not os.path.exists(filename):
+            self.save_to_file(filename)
 
     def load_from_file(self, filename):
+        import json
+        errors = []
+        try:
+            stat = os.stat(filename)
+            key = (stat.st_mtime_ns, stat.st_size)
+            entry = _LOAD_CACHE.get(filename)
+            if entry and entry[0] == key:
+                items = entry[1]
+            else:
+                with open(filename, 'r', encoding='utf-8') as f:
+                    items = json.load(f)
+                _LOAD_CACHE.clear()
+                _LOAD_CACHE[filename] = (key, items)
+        except FileNotFoundError:
+            items = []
+        except ValueError as e:
+            items = []
+            errors.append(f"Could not read {filename}: {e}")
+        self._load_items(items, errors)
+        self._dirty = False
+        return errors
+
+    def load_from_pickle(self, filename):
+        import pickle
+
+        class LegacyUnpickler(pickle.Unpickler):
+            def find_class(self, module, name):
+                if name in ("Record", "Name", "Phone", "Birthday"):
+                    return _LegacyObject
+                if (module, name) == ("datetime", "date"):
+                    return date
+                raise pickle.UnpicklingError(f"Unsupported object {module}.{name}")
+
+        errors = []
+        items = []
         try:
             with open(filename, 'rb') as f:
-                self.data = pickle.load(f)
-        except (FileNotFoundError, EOFError):
-            self.data = {}
+                data = LegacyUnpickler(f).load()
+            for legacy in data.values():
+                try:
+                    items.append(_legacy_item(legacy))
+                except AttributeError as e:
+                    errors.append(f"Skipped invalid contact in {filename}: {e}")
+        except FileNotFoundError:
+            pass
+        except (pickle.UnpicklingError, EOFError, AttributeError, TypeError, ValueError) as e:
+            errors.append(f"Could not read {filename}: {e}")
+        self._load_items(items, errors)
+        self._dirty = True
+        return errors
+
+    def _load_items(self, items, errors):
+        if not isinstance(items, list):
+            errors.append("Skipped address book data: expected a list of contacts")
+            items = []
+        self.data = {}
+        for item in items:
+            try:
+                record = Record.from_dict(item)
+            except KeyError as e:
+                errors.append(f"Skipped invalid contact {item!r}: missing {e}")
+                continue
+            except (TypeError, ValueError) as e:
+                errors.append(f"Skipped invalid contact {item!r}: {e}")
+                continue
+            self.data[record.name.value] = record
+        self._adopt_records()
+
+
+class _LegacyObject:
+    pass
+
+
+def _legacy_item(legacy):
+    birthday = getattr(legacy, "birthday", None)
+    return {
+        "name": legacy.name.value,
+        "phones": [getattr(phone, "value", phone) for phone in legacy.phones],
+        "birthday": birthday.value if birthday else None,
+    }
+
+
+def backup_file(filename):
+    backup = f"{filename}.bak"
+    counter = 1
+    while os.path.exists(backup):
+        backup = f"{filename}.bak{counter}"
+        counter += 1
+    os.replace(filename, backup)
+    return backup
 
 
 def input_error(func):
@@ -142,8 +379,9 @@ def add_contact(args, book):
     name, phone = args
     record = book.find(name)
     if record:
-        record.add_phone(phone)
-        return "Phone added."
+        if record.add_phone(phone):
+            return "Phone added."
+        return "Phone already exists."
     else:
         record = Record(name)
         record.add_phone(phone)
@@ -171,14 +409,16 @@ def show_phone(args, book):
     name = args[0]
     record = book.find(name)
     if record:
-        return '; '.join(phone.value for phone in record.phones)
+        return '; '.join(record.phones)
     else:
         raise KeyError(name)
 
 
 @input_error
 def show_all(book):
-    return '\n'.join(str(record) for record in book.values())
+    if not book:
+        return ""
+    return '\n'.join([str(record) for record in book.values()])
 
 
 @input_error
@@ -210,6 +450,8 @@ def show_birthday(args, book):
 
 @input_error
 def birthdays(book):
+    if not book:
+        return "No upcoming birthdays in the next week."
     upcoming = book.get_upcoming_birthdays()
     if upcoming:
         return '\n'.join(f"{b['name']}: {b['congratulation_date']}" for b in upcoming)
@@ -217,44 +459,67 @@ def birthdays(book):
         return "No upcoming birthdays in the next week."
 
 
+COMMANDS = {
+    "hello": lambda args, book: "How can I help you?",
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "all": lambda args, book: show_all(book),
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": lambda args, book: birthdays(book),
+}
+
+
 def parse_input(user_input):
-    cmd, *args = re.findall(r'\S+', user_input)
-    cmd = cmd.strip().lower()
-    return cmd, args
+    parts = user_input.split()
+    if not parts:
+        return "", []
+    return parts[0].lower(), parts[1:]
 
 
 def main():
     book = AddressBook()
-    filename = "address_book.pkl"
-    book.load_from_file(filename)
+    filename = "address_book.json"
+    legacy_filename = "address_book.pkl"
+    can_save = True
+    if not os.path.exists(filename) and os.path.exists(legacy_filename):
+        errors = book.load_from_pickle(legacy_filename)
+        for error in errors:
+            print(error)
+        if errors:
+            can_save = False
+            print(f"{legacy_filename} was not migrated; changes made in this session will not be saved.")
+        else:
+            book.save_to_file(filename)
+    else:
+        errors = book.load_from_file(filename)
+        for error in errors:
+            print(error)
+        if errors and os.path.exists(filename):
+            print(f"The original {filename} was moved to {backup_file(filename)}.")
+
+    read_input = input
+    parse = parse_input
+    get_handler = COMMANDS.get
+    book_save = book.save_if_dirty
 
     print("Welcome to the assistant bot!")
     while True:
-        user_input = input("Enter a command: ")
-        command, args = parse_input(user_input)
+        user_input = read_input("Enter a command: ")
+        command, args = parse(user_input)
 
-        if command in ["close", "exit"]:
-            book.save_to_file(filename)
+        if command in ("close", "exit"):
+            if can_save:
+                book_save(filename)
             print("Good bye!")
             break
-        elif command == "hello":
-            print("How can I help you?")
-        elif command == "add":
-            print(add_contact(args, book))
-        elif command == "change":
-            print(change_contact(args, book))
-        elif command == "phone":
-            print(show_phone(args, book))
-        elif command == "all":
-            print(show_all(book))
-        elif command == "add-birthday":
-            print(add_birthday(args, book))
-        elif command == "show-birthday":
-            print(show_birthday(args, book))
-        elif command == "birthdays":
-            print(birthdays(book))
         else:
-            print("Invalid command.")
+            handler = get_handler(command)
+            if handler:
+                print(handler(args, book))
+            else:
+                print("Invalid command.")
 
 
 if __name__ == "__main__":